@@ -0,0 +1,594 @@
+import sys
+import asyncio
+import argparse
+import base64
+import contextlib
+import json
+import multiprocessing
+import os
+import random
+import socket
+import struct
+import tempfile
+import time
+import urllib.parse
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Proxy Checker benchmark - checking simulated local proxies"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="100,500,1000",
+        help="Comma-separated proxy list sizes (default: 100,500,1000)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="10,50,100",
+        help="Comma-separated concurrency levels (default: 10,50,100)",
+    )
+    parser.add_argument(
+        "--protocols",
+        default="http,socks4,socks5",
+        help="Comma-separated proxy protocols to simulate (default: http,socks4,socks5)",
+    )
+    parser.add_argument(
+        "--timeout", type=int, default=2, help="Check timeout in seconds (default: 2)"
+    )
+    parser.add_argument(
+        "--retry-count", type=int, default=0, help="Retry count (default: 0)"
+    )
+    parser.add_argument(
+        "--latency",
+        type=int,
+        default=50,
+        help="Base handshake latency of simulated proxies in ms (default: 50)",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=int,
+        default=100,
+        help="Maximum extra random latency in ms (default: 100)",
+    )
+    parser.add_argument(
+        "--drop-rate",
+        type=float,
+        default=0.1,
+        help="Share of proxies that drop every connection (default: 0.1)",
+    )
+    parser.add_argument(
+        "--hang-rate",
+        type=float,
+        default=0.05,
+        help="Share of proxies that accept but never respond (default: 0.05)",
+    )
+    parser.add_argument(
+        "--auth-rate",
+        type=float,
+        default=0.2,
+        help="Share of proxies that require authentication (default: 0.2)",
+    )
+    parser.add_argument(
+        "--bad-auth-rate",
+        type=float,
+        default=0.05,
+        help="Share of proxies listed with wrong credentials (default: 0.05)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=1, help="Random seed (default: 1)"
+    )
+    parser.add_argument(
+        "--parse-lines",
+        type=int,
+        default=None,
+        help="Only benchmark parsing of this many generated proxy lines",
+    )
+    parser.add_argument(
+        "-o", "--output", help="Save benchmark results to this JSON file"
+    )
+    args = parser.parse_args()
+
+    protocols = [p.strip().lower() for p in args.protocols.split(",") if p.strip()]
+    unsupported = [p for p in protocols if p not in PROXY_HANDLERS]
+    if not protocols or unsupported:
+        parser.error(
+            f"unsupported protocols: {', '.join(unsupported) or 'none given'} "
+            f"(choose from {', '.join(PROXY_HANDLERS)})"
+        )
+
+    return args
+
+
+def build_proxy_specs(count, args):
+    """Assign a deterministic behaviour to every simulated proxy"""
+    rng = random.Random(args.seed)
+    protocols = [p.strip().lower() for p in args.protocols.split(",") if p.strip()]
+    specs = []
+
+    for i in range(count):
+        roll = rng.random()
+        if roll < args.drop_rate:
+            behaviour = "drop"
+        elif roll < args.drop_rate + args.hang_rate:
+            behaviour = "hang"
+        else:
+            behaviour = "ok"
+
+        auth = None
+        listed_auth = None
+        if rng.random() < args.auth_rate:
+            auth = (f"user{i}", f"pass{i}")
+            listed_auth = auth
+            if rng.random() < args.bad_auth_rate / args.auth_rate:
+                listed_auth = (f"user{i}", "wrong")
+
+        latency = args.latency + rng.randint(0, max(args.jitter, 0))
+        protocol = protocols[i % len(protocols)]
+
+        # SOCKS4 has no password, only the user id is compared
+        auth_matches = auth == listed_auth or (
+            protocol == "socks4" and auth[0] == listed_auth[0]
+        )
+
+        specs.append(
+            {
+                "protocol": protocol,
+                "behaviour": behaviour,
+                "latency": latency,
+                "auth": auth,
+                "listed_auth": listed_auth,
+                "expected": behaviour == "ok"
+                and auth_matches
+                and latency < args.timeout * 1000,
+            }
+        )
+
+    return specs
+
+
+async def pipe_stream(reader, writer):
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except Exception:
+        pass
+    finally:
+        writer.close()
+
+
+async def relay(client_reader, client_writer, host, port, request_head=b""):
+    try:
+        target_reader, target_writer = await asyncio.open_connection(host, port)
+    except Exception:
+        client_writer.close()
+        return
+    target_writer.write(request_head)
+    await asyncio.gather(
+        pipe_stream(client_reader, target_writer),
+        pipe_stream(target_reader, client_writer),
+    )
+
+
+async def handle_http_proxy(spec, reader, writer):
+    request = await reader.readuntil(b"\r\n\r\n")
+    lines = request.decode("latin-1").split("\r\n")
+    method, target, version = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    await asyncio.sleep(spec["latency"] / 1000)
+
+    if spec["auth"]:
+        expected = base64.b64encode(":".join(spec["auth"]).encode()).decode()
+        if headers.get("proxy-authorization") != f"Basic {expected}":
+            writer.write(b"HTTP/1.1 407 Proxy Authentication Required\r\n\r\n")
+            await writer.drain()
+            writer.close()
+            return
+
+    if method.upper() != "CONNECT":
+        # Forward request: pass it on with the proxy's own headers replaced
+        url = urllib.parse.urlsplit(target)
+        if url.scheme != "http":
+            writer.write(b"HTTP/1.1 405 Method Not Allowed\r\n\r\n")
+            await writer.drain()
+            writer.close()
+            return
+        path = (url.path or "/") + (f"?{url.query}" if url.query else "")
+        request_lines = [f"{method} {path} {version}"]
+        request_lines += [
+            line
+            for line in lines[1:]
+            if line and not line.lower().startswith("proxy-")
+        ]
+        request_lines.append("Via: 1.1 benchmark-proxy")
+        request_head = ("\r\n".join(request_lines) + "\r\n\r\n").encode("latin-1")
+        await relay(reader, writer, url.hostname, url.port or 80, request_head)
+        return
+
+    host, port = target.rsplit(":", 1)
+    writer.write(b"HTTP/1.1 200 Connection established\r\n\r\n")
+    await writer.drain()
+    await relay(reader, writer, host.strip("[]"), int(port))
+
+
+async def handle_socks4_proxy(spec, reader, writer):
+    _, command, port = struct.unpack("!BBH", await reader.readexactly(4))
+    address = await reader.readexactly(4)
+    user_id = (await reader.readuntil(b"\x00"))[:-1].decode()
+    host = socket.inet_ntoa(address)
+    if address[:3] == b"\x00\x00\x00" and address[3] != 0:
+        host = (await reader.readuntil(b"\x00"))[:-1].decode()
+
+    await asyncio.sleep(spec["latency"] / 1000)
+
+    if command != 1 or (spec["auth"] and user_id != spec["auth"][0]):
+        writer.write(b"\x00\x5b" + b"\x00" * 6)
+        await writer.drain()
+        writer.close()
+        return
+
+    writer.write(b"\x00\x5a" + b"\x00" * 6)
+    await writer.drain()
+    await relay(reader, writer, host, port)
+
+
+async def handle_socks5_proxy(spec, reader, writer):
+    _, method_count = await reader.readexactly(2)
+    methods = await reader.readexactly(method_count)
+
+    await asyncio.sleep(spec["latency"] / 1000)
+
+    method = 0x02 if spec["auth"] else 0x00
+    if method not in methods:
+        writer.write(b"\x05\xff")
+        await writer.drain()
+        writer.close()
+        return
+    writer.write(bytes([0x05, method]))
+    await writer.drain()
+
+    if spec["auth"]:
+        _, username_length = await reader.readexactly(2)
+        username = (await reader.readexactly(username_length)).decode()
+        (password_length,) = await reader.readexactly(1)
+        password = (await reader.readexactly(password_length)).decode()
+        if (username, password) != tuple(spec["auth"]):
+            writer.write(b"\x01\x01")
+            await writer.drain()
+            writer.close()
+            return
+        writer.write(b"\x01\x00")
+        await writer.drain()
+
+    _, command, _, address_type = await reader.readexactly(4)
+    if address_type == 0x01:
+        host = socket.inet_ntoa(await reader.readexactly(4))
+    elif address_type == 0x03:
+        (length,) = await reader.readexactly(1)
+        host = (await reader.readexactly(length)).decode()
+    else:
+        host = socket.inet_ntop(socket.AF_INET6, await reader.readexactly(16))
+    (port,) = struct.unpack("!H", await reader.readexactly(2))
+
+    if command != 1:
+        writer.write(b"\x05\x07\x00\x01" + b"\x00" * 6)
+        await writer.drain()
+        writer.close()
+        return
+
+    writer.write(b"\x05\x00\x00\x01" + b"\x00" * 6)
+    await writer.drain()
+    await relay(reader, writer, host, port)
+
+
+PROXY_HANDLERS = {
+    "http": handle_http_proxy,
+    "https": handle_http_proxy,
+    "socks4": handle_socks4_proxy,
+    "socks5": handle_socks5_proxy,
+}
+
+
+def make_proxy_handler(spec):
+    handler = PROXY_HANDLERS[spec["protocol"]]
+
+    async def handle(reader, writer):
+        try:
+            if spec["behaviour"] == "drop":
+                writer.close()
+                return
+            if spec["behaviour"] == "hang":
+                await reader.read()
+                writer.close()
+                return
+            await handler(spec, reader, writer)
+        except Exception:
+            writer.close()
+
+    return handle
+
+
+async def handle_target(reader, writer):
+    try:
+        while True:
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\nConnection: keep-alive\r\n\r\n"
+            )
+            await writer.drain()
+    except Exception:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_fake_network(specs, connection):
+    servers = [await asyncio.start_server(handle_target, "127.0.0.1", 0)]
+    for spec in specs:
+        servers.append(
+            await asyncio.start_server(make_proxy_handler(spec), "127.0.0.1", 0)
+        )
+
+    connection.send([server.sockets[0].getsockname()[1] for server in servers])
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, connection.recv)
+
+    for server in servers:
+        server.close()
+
+
+def run_fake_network(specs, connection):
+    """Run the local target and simulated proxies in a separate process"""
+    raise_file_limit()
+    if sys.platform.startswith("win"):
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(serve_fake_network(specs, connection))
+
+
+def raise_file_limit():
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or hard > soft:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def format_proxy(spec, port):
+    auth = spec["listed_auth"]
+    proxy_auth = f"{auth[0]}:{auth[1]}@" if auth else ""
+    return f"{spec['protocol']}://{proxy_auth}127.0.0.1:{port}"
+
+
+def get_peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+async def run_benchmark(proxy_checker, proxy_lines, expected, concurrency):
+    proxy_checker.CONCURRENT_CHECKS = concurrency
+    parsed_proxies, _ = proxy_checker.parse_proxies(proxy_lines)
+
+    start_time = time.perf_counter()
+    start_cpu = time.process_time()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        result = await proxy_checker.process_proxies(parsed_proxies)
+    elapsed = time.perf_counter() - start_time
+    cpu = time.process_time() - start_cpu
+
+    found = set(result["proxy_strings"])
+    correct = sum(1 for proxy in proxy_lines if (proxy in found) == expected[proxy])
+
+    return {
+        "proxies": len(proxy_lines),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "checks_per_second": round(len(proxy_lines) / elapsed, 1),
+        "cpu_seconds": round(cpu, 2),
+        "peak_rss_mb": get_peak_rss_mb(),
+        "working": len(found),
+        "expected_working": sum(1 for proxy in proxy_lines if expected[proxy]),
+        "accuracy": round(correct / len(proxy_lines), 4),
+    }
+
+
+def build_proxy_lines(count, seed):
+    """Generate proxy lines in every supported format, about 1% invalid"""
+    rng = random.Random(seed)
+    lines = []
+
+    for i in range(count):
+        host = ".".join(
+            str(rng.randint(low, high))
+            for low, high in ((1, 223), (0, 255), (0, 255), (1, 254))
+        )
+        port = rng.randint(1, 65535)
+        kind = rng.random()
+        if kind < 0.01:
+            lines.append(f"{host}:{port + 65536}")
+        elif kind < 0.4:
+            lines.append(f"{host}:{port}")
+        elif kind < 0.7:
+            protocol = rng.choice(["http", "https", "socks4", "socks5"])
+            lines.append(f"{protocol}://{host}:{port}")
+        elif kind < 0.85:
+            lines.append(f"socks5://user{i}:pass{i}@{host}:{port}")
+        elif kind < 0.95:
+            lines.append(f"{host}:{port}:user{i}:pass{i}")
+        else:
+            lines.append(f"http://[2001:db8::{i % 65536:x}]:{port}")
+
+    return lines
+
+
+def run_parse_benchmark(count, seed, rounds=3):
+    sys.argv = [sys.argv[0]]
+    import proxy_checker
+
+    proxy_lines = build_proxy_lines(count, seed)
+    timings = []
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        parsed_proxies, invalid_proxies = proxy_checker.parse_proxies(proxy_lines)
+        timings.append(time.perf_counter() - start_time)
+
+    best = min(timings)
+    return {
+        "lines": count,
+        "valid": len(parsed_proxies),
+        "invalid": len(invalid_proxies),
+        "best_seconds": round(best, 3),
+        "lines_per_second": round(count / best),
+    }
+
+
+def run_checker(config_path, proxy_lines, expected, concurrency, connection):
+    """Run one benchmark in a fresh process so peak RSS belongs to this run"""
+    raise_file_limit()
+    sys.argv = [sys.argv[0], "-c", config_path]
+    import proxy_checker
+
+    if sys.platform.startswith("win"):
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    connection.send(
+        asyncio.run(run_benchmark(proxy_checker, proxy_lines, expected, concurrency))
+    )
+
+
+def main(args, config_path, proxy_lines, expected):
+    sizes = [int(size) for size in args.sizes.split(",")]
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+    results = []
+
+    print(
+        f"{'proxies':>8} {'conc':>5} {'sec':>7} {'checks/s':>9} "
+        f"{'cpu s':>7} {'rss MB':>7} {'working':>8} {'accuracy':>9}"
+    )
+    for size in sizes:
+        for concurrency in concurrency_levels:
+            parent_connection, child_connection = multiprocessing.Pipe()
+            checker = multiprocessing.Process(
+                target=run_checker,
+                args=(
+                    config_path,
+                    proxy_lines[:size],
+                    expected,
+                    concurrency,
+                    child_connection,
+                ),
+            )
+            checker.start()
+            child_connection.close()
+            try:
+                result = parent_connection.recv()
+            except EOFError:
+                result = None
+            checker.join()
+
+            if result is None or checker.exitcode != 0:
+                print(
+                    f"{size:>8} {concurrency:>5} ❌ Benchmark process failed "
+                    f"(exit code {checker.exitcode})"
+                )
+                continue
+
+            results.append(result)
+            print(
+                f"{result['proxies']:>8} {result['concurrency']:>5} "
+                f"{result['seconds']:>7} {result['checks_per_second']:>9} "
+                f"{result['cpu_seconds']:>7} {result['peak_rss_mb'] or 'N/A':>7} "
+                f"{result['working']:>4}/{result['expected_working']:<3} "
+                f"{result['accuracy'] * 100:>8.1f}%"
+            )
+
+    return results
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.parse_lines is not None:
+        result = run_parse_benchmark(args.parse_lines, args.seed)
+        print(
+            f"Parsed {result['lines']} lines ({result['valid']} valid, "
+            f"{result['invalid']} invalid) in {result['best_seconds']}s, "
+            f"{result['lines_per_second']} lines/s (best of 3)"
+        )
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(result, file, indent=4)
+            print(f"Benchmark results saved to {args.output}")
+        sys.exit(0)
+
+    raise_file_limit()
+
+    max_size = max(int(size) for size in args.sizes.split(","))
+    specs = build_proxy_specs(max_size, args)
+
+    parent_connection, child_connection = multiprocessing.Pipe()
+    network = multiprocessing.Process(
+        target=run_fake_network, args=(specs, child_connection), daemon=True
+    )
+    network.start()
+    child_connection.close()
+    try:
+        target_port, *proxy_ports = parent_connection.recv()
+    except EOFError:
+        network.join()
+        print(
+            f"❌ Failed to start simulated proxies (exit code {network.exitcode})"
+        )
+        sys.exit(1)
+
+    proxy_lines = [format_proxy(spec, port) for spec, port in zip(specs, proxy_ports)]
+    expected = {proxy: spec["expected"] for proxy, spec in zip(proxy_lines, specs)}
+
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".json", delete=False
+    ) as config_file:
+        json.dump(
+            {
+                "proxy_file": "proxy.txt",
+                "output_file": "working_proxies.txt",
+                "test_urls": [f"http://127.0.0.1:{target_port}/"],
+                "timeout": args.timeout,
+                "concurrent_checks": 1,
+                "save_to_input_file": False,
+                "retry_count": args.retry_count,
+                "speed_filter": {"enabled": False, "max_speed": 1000, "min_speed": 0},
+            },
+            config_file,
+        )
+
+    try:
+        results = main(args, config_file.name, proxy_lines, expected)
+    finally:
+        os.remove(config_file.name)
+        parent_connection.send("stop")
+        network.join(timeout=5)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=4)
+        print(f"Benchmark results saved to {args.output}")
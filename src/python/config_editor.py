@@ -49,6 +49,10 @@ def load_config(config_file):
             "save_to_input_file": False,
             "retry_count": 1,
             "speed_filter": {"enabled": False, "max_speed": 1000, "min_speed": 0},
+            "anonymity_check": {
+                "enabled": False,
+                "echo_url": "http://httpbin.org/get",
+            },
         }
 
 
@@ -163,6 +167,28 @@ def edit_config(config_file):
 
     config["speed_filter"] = speed_filter
 
+    if "anonymity_check" not in config:
+        config["anonymity_check"] = {
+            "enabled": False,
+            "echo_url": "http://httpbin.org/get",
+        }
+
+    anonymity_check = config["anonymity_check"]
+    print("\nAnonymity Check Configuration:")
+
+    enable_check = input(
+        f"Enable anonymity check (y/n) [{('y' if anonymity_check.get('enabled', False) else 'n')}]: "
+    )
+    if enable_check.lower() in ["y", "yes"]:
+        anonymity_check["enabled"] = True
+        anonymity_check["echo_url"] = input(
+            f"Echo URL [{anonymity_check.get('echo_url', '')}]: "
+        ) or anonymity_check.get("echo_url", "")
+    elif enable_check.lower() in ["n", "no"]:
+        anonymity_check["enabled"] = False
+
+    config["anonymity_check"] = anonymity_check
+
     if save_config(config, config_file):
         print("Configuration successfully updated!")
         display_config(config)
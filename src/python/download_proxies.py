@@ -24,6 +24,13 @@ def parse_args():
         default=DEFAULT_CONFIG_FILE,
         help=f"Path to the configuration file (default: {DEFAULT_CONFIG_FILE})",
     )
+    parser.add_argument(
+        "-d",
+        "--deadline",
+        type=float,
+        default=None,
+        help="Time budget for the check in seconds; likely working proxies are checked first",
+    )
     return parser.parse_args()
 
 
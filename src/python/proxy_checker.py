@@ -6,10 +6,14 @@ import json
 import argparse
 import os
 import random
+import time
+import re
+import ipaddress
 from aiohttp_socks import ProxyConnector, ProxyType
 from asyncio import Semaphore
 
 DEFAULT_CONFIG_FILE = os.path.join("config", "config.json")
+DEFAULT_ECHO_URL = "http://httpbin.org/get"
 
 
 def parse_args():
@@ -20,6 +24,13 @@ def parse_args():
         default=DEFAULT_CONFIG_FILE,
         help=f"Path to the configuration file (default: {DEFAULT_CONFIG_FILE})",
     )
+    parser.add_argument(
+        "-d",
+        "--deadline",
+        type=float,
+        default=None,
+        help="Time budget for the check in seconds; likely working proxies are checked first",
+    )
     return parser.parse_args()
 
 
@@ -57,6 +68,10 @@ def load_config(config_file):
                 "max_speed": 1000,
                 "min_speed": 0,
             },
+            "anonymity_check": {
+                "enabled": False,
+                "echo_url": DEFAULT_ECHO_URL,
+            },
         }
 
 
@@ -74,6 +89,7 @@ def save_config(config_data, config_file):
 
 args = parse_args()
 CONFIG_FILE = args.config
+DEADLINE = args.deadline
 
 config = load_config(CONFIG_FILE)
 PROXY_FILE = os.path.join("data", os.path.basename(config["proxy_file"]))
@@ -86,6 +102,27 @@ RETRY_COUNT = config.get("retry_count", 1)
 SPEED_FILTER = config.get(
     "speed_filter", {"enabled": False, "max_speed": 1000, "min_speed": 0}
 )
+ANONYMITY_CHECK = {
+    "enabled": False,
+    "echo_url": DEFAULT_ECHO_URL,
+    **config.get("anonymity_check", {}),
+}
+PROXY_HEADERS = [
+    "via",
+    "x-forwarded-for",
+    "x-forwarded-host",
+    "x-forwarded-proto",
+    "forwarded",
+    "forwarded-for",
+    "x-real-ip",
+    "client-ip",
+    "x-client-ip",
+    "x-proxy-id",
+    "proxy-connection",
+]
+real_ip = None
+HISTORY_FILE = os.path.join("data", "proxy_history.json")
+HISTORY_MAX_AGE = 30 * 24 * 60 * 60
 
 data_dir = os.path.join(get_project_root(), "data")
 if not os.path.exists(data_dir):
@@ -102,114 +139,124 @@ def read_proxies_from_file(file_path):
         return []
 
 
+SUPPORTED_PROTOCOLS = ("http", "https", "socks4", "socks5")
+
+# https proxies are HTTP CONNECT proxies too; python-socks has no https scheme
+PROXY_TYPES = {
+    "http": ProxyType.HTTP,
+    "https": ProxyType.HTTP,
+    "socks4": ProxyType.SOCKS4,
+    "socks5": ProxyType.SOCKS5,
+}
+
+
 def parse_proxy_string(proxy_str):
-    """Parse proxy string in different formats"""
+    """Parse and validate proxy string in a single pass.
+
+    Supported formats: [protocol://][user:pass@]host:port, host:port:user:pass
+    and IPv6 hosts written as [addr]:port. Returns None for malformed input.
+    """
     protocol = "http"
     username = None
     password = None
-    host = None
-    port = None
-
-    if "://" in proxy_str:
-        protocol, proxy_str = proxy_str.split("://", 1)
-
-    if "@" in proxy_str:
-        auth, hostport = proxy_str.rsplit("@", 1)
-        username, password = auth.split(":", 1)
-        host, port = hostport.split(":", 1)
+    rest = proxy_str
+
+    if "://" in rest:
+        protocol, rest = rest.split("://", 1)
+        protocol = protocol.lower()
+        if protocol not in SUPPORTED_PROTOCOLS:
+            return None
+
+    if "@" in rest:
+        auth, rest = rest.rsplit("@", 1)
+        username, _, password = auth.partition(":")
+        if not username or not password:
+            return None
+
+    if rest[:1] == "[":
+        host, _, port = rest[1:].partition("]:")
+        try:
+            ipaddress.IPv6Address(host)
+        except ValueError:
+            return None
     else:
-        parts = proxy_str.split(":")
-        if len(parts) == 4:
+        parts = rest.split(":")
+        if len(parts) == 2:
+            host, port = parts
+        elif len(parts) == 4 and username is None:
             host, port, username, password = parts
+            if not username or not password:
+                return None
         else:
-            host, port = parts[0:2]
+            return None
+        if not host or "/" in host:
+            return None
+
+    if not (port.isascii() and port.isdigit()) or len(port) > 5:
+        return None
+    port = int(port)
+    if not (0 < port < 65536):
+        return None
 
     return {
-        "protocol": protocol.lower(),
+        "protocol": protocol,
         "host": host,
-        "port": int(port),
+        "port": port,
         "username": username,
         "password": password,
+        "proxy": proxy_str,
     }
 
 
-def validate_proxy_string(proxy_str):
-    """Validate proxy string format"""
-    try:
-        if "://" in proxy_str:
-            protocol, rest = proxy_str.split("://", 1)
-            if protocol.lower() not in ["http", "https", "socks4", "socks5"]:
-                return False
-
-        parts = proxy_str.split(":")
-        if "@" in proxy_str:
-            if proxy_str.count(":") < 2 or proxy_str.count("@") != 1:
-                return False
+def parse_proxies(proxy_lines):
+    """Split raw proxy lines into parsed proxy records and invalid lines"""
+    parsed = []
+    invalid = []
+    for line in proxy_lines:
+        proxy_info = parse_proxy_string(line)
+        if proxy_info is None:
+            invalid.append(line)
         else:
-            if len(parts) < 2:
-                return False
-
-            try:
-                port = int(parts[-1].split("@")[0] if "@" in parts[-1] else parts[-1])
-                if not (0 < port < 65536):
-                    return False
-            except ValueError:
-                return False
+            parsed.append(proxy_info)
+    return parsed, invalid
 
-        return True
-    except Exception:
-        return False
 
-
-async def check_proxy(proxy_str):
+async def check_proxy(proxy_info):
+    proxy_str = proxy_info["proxy"]
     try:
-        if not validate_proxy_string(proxy_str):
-            print(f"❌ Invalid format: {proxy_str}")
-            return {
-                "working": False,
-                "success_rate": 0,
-                "speed": None,
-                "proxy": proxy_str,
-            }
-
-        proxy_info = parse_proxy_string(proxy_str)
         protocol = proxy_info["protocol"]
-        host = proxy_info["host"]
-        port = proxy_info["port"]
-        username = proxy_info["username"]
-        password = proxy_info["password"]
-
-        proxy_auth = f"{username}:{password}@" if username and password else ""
-        proxy_url = f"{protocol}://{proxy_auth}{host}:{port}"
-
-        if protocol in ["http", "https"]:
-            connector = ProxyConnector.from_url(proxy_url)
-        elif protocol == "socks4":
-            connector = ProxyConnector(
-                proxy_type=ProxyType.SOCKS4,
-                host=host,
-                port=port,
-                username=username,
-                password=password,
-            )
-        elif protocol == "socks5":
+        anonymity_check = ANONYMITY_CHECK["enabled"]
+        request_options = {}
+
+        if protocol in ["http", "https"] and anonymity_check:
+            # A proxy cannot add headers inside a CONNECT tunnel, so the echo
+            # request is sent as a plain forward request through the proxy
+            connector = None
+            host = proxy_info["host"]
+            if ":" in host:
+                host = f"[{host}]"
+            request_options["proxy"] = f"http://{host}:{proxy_info['port']}"
+            if proxy_info["username"] and proxy_info["password"]:
+                request_options["proxy_auth"] = aiohttp.BasicAuth(
+                    proxy_info["username"], proxy_info["password"]
+                )
+        else:
             connector = ProxyConnector(
-                proxy_type=ProxyType.SOCKS5,
-                host=host,
-                port=port,
-                username=username,
-                password=password,
+                proxy_type=PROXY_TYPES[protocol],
+                host=proxy_info["host"],
+                port=proxy_info["port"],
+                username=proxy_info["username"],
+                password=proxy_info["password"],
             )
-        else:
-            print(f"❌ Failed: {proxy_str} (Unsupported protocol: {protocol})")
-            return {
-                "working": False,
-                "success_rate": 0,
-                "speed": None,
-                "proxy": proxy_str,
-            }
 
-        test_url = random.choice(TEST_URLS)
+        # The echo request doubles as the speed test, so classifying
+        # anonymity needs no extra connection through the proxy
+        if anonymity_check:
+            method = "GET"
+            test_url = ANONYMITY_CHECK["echo_url"]
+        else:
+            method = "HEAD"
+            test_url = random.choice(TEST_URLS)
 
         timeout_obj = aiohttp.ClientTimeout(total=TIMEOUT)
 
@@ -218,18 +265,29 @@ async def check_proxy(proxy_str):
             async with aiohttp.ClientSession(
                 connector=connector, timeout=timeout_obj
             ) as session:
-                async with session.head(test_url) as response:
+                async with session.request(
+                    method, test_url, **request_options
+                ) as response:
                     end_time = asyncio.get_event_loop().time()
                     response_time = (end_time - start_time) * 1000
 
                     working = 200 <= response.status < 300
 
-                    return {
+                    result = {
                         "working": working,
                         "success_rate": 1.0 if working else 0.0,
                         "speed": int(response_time) if working else None,
                         "proxy": proxy_str,
                     }
+
+                    if anonymity_check and working:
+                        try:
+                            echo_data = await response.json(content_type=None)
+                        except Exception:
+                            echo_data = None
+                        result["anonymity"] = classify_anonymity(echo_data)
+
+                    return result
         except Exception as e:
             return {
                 "working": False,
@@ -250,6 +308,158 @@ async def check_proxy(proxy_str):
         }
 
 
+def is_valid_history(history):
+    if not isinstance(history, dict):
+        return False
+    groups = history.get("groups")
+    proxies = history.get("proxies")
+    if not isinstance(groups, dict) or not isinstance(proxies, dict):
+        return False
+    for entry in list(groups.values()) + list(proxies.values()):
+        if not (
+            isinstance(entry, dict)
+            and isinstance(entry.get("checks"), int)
+            and isinstance(entry.get("working"), int)
+            and isinstance(entry.get("last_checked"), (int, float))
+        ):
+            return False
+    return all(
+        isinstance(entry.get("speed"), (int, type(None)))
+        for entry in proxies.values()
+    )
+
+
+def load_history(file_path):
+    empty_history = {"groups": {}, "proxies": {}}
+    try:
+        full_path = get_file_path(file_path)
+        if not os.path.exists(full_path):
+            return empty_history
+        with open(full_path, "r") as file:
+            history = json.load(file)
+        if not is_valid_history(history):
+            print("Error loading history file: unexpected format, starting empty")
+            return empty_history
+        return history
+    except Exception as e:
+        print(f"Error loading history file: {e}")
+        return empty_history
+
+
+def save_history(history, file_path):
+    try:
+        full_path = get_file_path(file_path)
+        with open(full_path, "w") as file:
+            json.dump(history, file)
+    except Exception as e:
+        print(f"Error saving history file: {e}")
+
+
+def get_proxy_network(host):
+    """Group IPv4 proxies by /24 network, IPv6 by /64, other hosts by themselves"""
+    if ":" in host:
+        return str(ipaddress.IPv6Network(f"{host}/64", strict=False))
+    parts = host.split(".")
+    if len(parts) == 4 and all(part.isdigit() for part in parts):
+        return ".".join(parts[:3])
+    return host
+
+
+def get_proxy_groups(proxy_info):
+    return (
+        f"protocol:{proxy_info['protocol']}",
+        f"port:{proxy_info['port']}",
+        f"network:{get_proxy_network(proxy_info['host'])}",
+    )
+
+
+def update_history(history, proxies, checked, proxy_objects):
+    """Record check results in the per-proxy entries and group counts.
+
+    Group counts do not depend on the current list, so they still describe
+    proxies that left it. Groups and proxies not checked for HISTORY_MAX_AGE
+    are dropped.
+    """
+    speeds = {p["proxy"]: p.get("speed") for p in proxy_objects}
+    groups = history["groups"]
+    entries = history["proxies"]
+    now = time.time()
+
+    for proxy_info in proxies:
+        proxy = proxy_info["proxy"]
+        if proxy not in checked:
+            continue
+
+        working = 1 if checked[proxy] else 0
+        for group in get_proxy_groups(proxy_info):
+            counts = groups.setdefault(
+                group, {"checks": 0, "working": 0, "last_checked": now}
+            )
+            counts["checks"] += 1
+            counts["working"] += working
+            counts["last_checked"] = now
+
+        entry = entries.setdefault(
+            proxy, {"checks": 0, "working": 0, "speed": None, "last_checked": now}
+        )
+        entry["checks"] += 1
+        entry["working"] += working
+        entry["last_checked"] = now
+        if working:
+            entry["speed"] = speeds.get(proxy, entry["speed"])
+
+    for section in ("groups", "proxies"):
+        history[section] = {
+            key: entry
+            for key, entry in history[section].items()
+            if now - entry["last_checked"] <= HISTORY_MAX_AGE
+        }
+    return history
+
+
+def prioritize_proxies(proxies, history):
+    """Order proxies by estimated chance of working, most likely first.
+
+    The estimate starts from the overall success rate and is refined by the
+    success rates of the proxy's protocol, port and network, then by its own
+    earlier results. Rates are smoothed so that few samples count for little.
+    """
+    smoothing = 5
+    groups = history["groups"]
+    entries = history["proxies"]
+
+    total_checks = 0
+    total_working = 0
+    for group, counts in groups.items():
+        if group.startswith("protocol:"):
+            total_checks += counts["checks"]
+            total_working += counts["working"]
+
+    if not total_checks:
+        return list(proxies)
+
+    prior = (total_working + 1) / (total_checks + 2)
+
+    def estimate(proxy_info):
+        rates = []
+        for group in get_proxy_groups(proxy_info):
+            counts = groups.get(group, {"checks": 0, "working": 0})
+            checks, working = counts["checks"], counts["working"]
+            rates.append((working + prior * smoothing) / (checks + smoothing))
+        rate = sum(rates) / len(rates)
+
+        entry = entries.get(proxy_info["proxy"])
+        if entry and entry["checks"]:
+            rate = (entry["working"] + rate * smoothing) / (
+                entry["checks"] + smoothing
+            )
+            speed = entry["speed"] if entry["speed"] is not None else float("inf")
+            return -rate, speed
+        return -rate, float("inf")
+
+    return sorted(proxies, key=estimate)
+
+
 def categorize_speed(speed):
     """Categorize proxy by speed"""
     if speed is None:
@@ -261,14 +471,62 @@ def categorize_speed(speed):
     return "slow"
 
 
-async def process_proxies(proxies):
+def classify_anonymity(echo_data):
+    """Classify proxy anonymity from an httpbin-style echo response"""
+    # Without the real IP a leaking proxy would look anonymous or elite
+    if real_ip is None or not isinstance(echo_data, dict):
+        return "unknown"
+
+    # Anything without origin and headers is not an echo response, e.g. a
+    # captive portal or an error page returned by the proxy
+    origin = echo_data.get("origin")
+    raw_headers = echo_data.get("headers")
+    if not isinstance(origin, str) or not isinstance(raw_headers, dict):
+        return "unknown"
+    headers = {name.lower(): str(value) for name, value in raw_headers.items()}
+
+    leaked_values = [origin] + list(headers.values())
+    if any(
+        real_ip in re.split(r"[\s,;=\"]+", value) for value in leaked_values
+    ):
+        return "transparent"
+    if any(name in headers for name in PROXY_HEADERS):
+        return "anonymous"
+    return "elite"
+
+
+async def get_real_ip():
+    """Get own IP address from the echo endpoint without a proxy"""
+    try:
+        timeout_obj = aiohttp.ClientTimeout(total=TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout_obj) as session:
+            async with session.get(ANONYMITY_CHECK["echo_url"]) as response:
+                echo_data = await response.json(content_type=None)
+                return echo_data["origin"].split(",")[0].strip()
+    except Exception as e:
+        print(f"Error getting real IP from echo endpoint: {e}")
+        return None
+
+
+async def process_proxies(proxies, deadline=None):
     sem = Semaphore(CONCURRENT_CHECKS)
     working_proxies = []
     total_proxies = len(proxies)
     processed_count = 0
     MAX_RETRIES = RETRY_COUNT
+    loop = asyncio.get_event_loop()
 
     retry_map = {}
+    checked = {}
+
+    def deadline_reached():
+        # New checks are only started if they can finish before the deadline
+        return deadline is not None and loop.time() + TIMEOUT > deadline
+
+    def get_check_timeout():
+        if deadline is None:
+            return TIMEOUT * 2
+        return max(min(TIMEOUT * 2, deadline - loop.time()), 0)
 
     def draw_progress_bar(current, total, bar_length=30):
         progress = int(round(bar_length * current / total))
@@ -276,18 +534,26 @@ async def process_proxies(proxies):
         percent = round((current / total) * 100)
         return f"[{bar}] {current}/{total} ({percent}%)"
 
-    async def check_with_sem(proxy, retry_count=0):
+    async def check_with_sem(proxy_info, retry_count=0):
         nonlocal processed_count
+        proxy = proxy_info["proxy"]
 
         async with sem:
+            if deadline_reached():
+                return False
+
             try:
-                result = await asyncio.wait_for(check_proxy(proxy), timeout=TIMEOUT * 2)
+                result = await asyncio.wait_for(
+                    check_proxy(proxy_info), timeout=get_check_timeout()
+                )
 
                 processed_count += 1
                 if processed_count % 5 == 0 or processed_count == total_proxies:
                     progress_bar = draw_progress_bar(processed_count, total_proxies)
                     print(progress_bar)
 
+                checked[proxy] = result["working"]
+
                 if result["working"]:
                     if SPEED_FILTER["enabled"] and result["speed"] is not None:
                         if (
@@ -303,8 +569,13 @@ async def process_proxies(proxies):
                     category = categorize_speed(speed)
                     success_percent = round(result["success_rate"] * 100)
 
+                    anonymity = (
+                        f" | Anonymity: {result['anonymity']}"
+                        if "anonymity" in result
+                        else ""
+                    )
                     print(
-                        f"✅ Working: {proxy} | Speed: {speed or 'N/A'}ms ({category}) | Success: {success_percent}%"
+                        f"✅ Working: {proxy} | Speed: {speed or 'N/A'}ms ({category}) | Success: {success_percent}%{anonymity}"
                     )
 
                     result["category"] = category
@@ -312,7 +583,7 @@ async def process_proxies(proxies):
                     return True
                 elif retry_count < MAX_RETRIES:
                     print(f"⚠️ Retry ({retry_count + 1}/{MAX_RETRIES}): {proxy}")
-                    retry_map[proxy] = retry_count + 1
+                    retry_map[proxy] = (proxy_info, retry_count + 1)
                     return False
                 else:
                     print(f"❌ Failed: {proxy}")
@@ -320,10 +591,12 @@ async def process_proxies(proxies):
 
             except asyncio.TimeoutError:
                 processed_count += 1
+                checked[proxy] = False
                 print(f"❌ Timeout: {proxy}")
                 return False
             except Exception as e:
                 processed_count += 1
+                checked[proxy] = False
                 print(f"❌ Error: {proxy} - {e}")
                 return False
 
@@ -331,24 +604,29 @@ async def process_proxies(proxies):
 
     batch_size = CONCURRENT_CHECKS * 2
     for i in range(0, len(proxies), batch_size):
+        if deadline_reached():
+            break
         batch = proxies[i : i + batch_size]
         tasks = [check_with_sem(proxy) for proxy in batch]
         await asyncio.gather(*tasks, return_exceptions=True)
 
     retry_proxies = [
-        proxy for proxy, count in retry_map.items() if count <= MAX_RETRIES
+        (proxy_info, count)
+        for proxy_info, count in retry_map.values()
+        if count <= MAX_RETRIES
     ]
 
-    if retry_proxies:
+    if retry_proxies and not deadline_reached():
         print(f"\nRetrying {len(retry_proxies)} proxies...")
         retry_tasks = [
-            check_with_sem(proxy, retry_map[proxy]) for proxy in retry_proxies
+            check_with_sem(proxy_info, count) for proxy_info, count in retry_proxies
         ]
         await asyncio.gather(*retry_tasks, return_exceptions=True)
 
     return {
         "proxy_strings": [p["proxy"] for p in working_proxies],
         "proxy_objects": working_proxies,
+        "checked": checked,
     }
 
 
@@ -373,6 +651,12 @@ async def save_working_proxies(proxies, file_path):
 
 
 async def main():
+    global real_ip
+
+    deadline = None
+    if DEADLINE is not None:
+        deadline = asyncio.get_event_loop().time() + DEADLINE
+
     print("Starting proxy check...")
     print(f"Using configuration from {CONFIG_FILE}")
     print(f"Proxy file: {PROXY_FILE}")
@@ -382,6 +666,7 @@ async def main():
     print(f"Concurrent checks: {CONCURRENT_CHECKS}")
     print(f"Save to input file: {SAVE_TO_INPUT_FILE}")
     print(f"Retry count: {RETRY_COUNT}")
+    print(f"Deadline: {f'{DEADLINE} seconds' if DEADLINE is not None else 'Disabled'}")
 
     if SPEED_FILTER["enabled"]:
         print(
@@ -390,21 +675,53 @@ async def main():
     else:
         print(f"Speed filter: Disabled")
 
+    if ANONYMITY_CHECK["enabled"]:
+        print(f"Anonymity check: Enabled ({ANONYMITY_CHECK['echo_url']})")
+        real_ip = await get_real_ip()
+        if real_ip:
+            print(f"Real IP: {real_ip}")
+        else:
+            print("Real IP: unknown, anonymity of all proxies will be unknown")
+    else:
+        print(f"Anonymity check: Disabled")
+
     proxies = read_proxies_from_file(PROXY_FILE)
     print(f"Loaded {len(proxies)} proxies from file {PROXY_FILE}")
 
-    if not proxies:
+    parsed_proxies, invalid_proxies = parse_proxies(proxies)
+    if invalid_proxies:
+        print(f"❌ Skipping {len(invalid_proxies)} proxies with invalid format:")
+        for proxy in invalid_proxies:
+            print(f"   {proxy}")
+
+    if not parsed_proxies:
         print("No proxies found for checking.")
         return
 
-    working_proxies = await process_proxies(proxies)
+    history = None
+    if deadline is not None:
+        history = load_history(HISTORY_FILE)
+        print("Ordering proxies by estimated chance of working...")
+        try:
+            parsed_proxies = prioritize_proxies(parsed_proxies, history)
+        except Exception as e:
+            print(f"Error ordering proxies, using file order: {e}")
+
+    working_proxies = await process_proxies(parsed_proxies, deadline)
+    checked = working_proxies["checked"]
+    unchecked_proxies = [
+        p["proxy"] for p in parsed_proxies if p["proxy"] not in checked
+    ]
 
     print("\nResults of the check:")
     print(f"Total proxies: {len(proxies)}")
+    print(f"Invalid format: {len(invalid_proxies)}")
     print(f"Working proxies: {len(working_proxies['proxy_strings'])}")
     print(
-        f"Not working proxies: {len(proxies) - len(working_proxies['proxy_strings'])}"
+        f"Not working proxies: {len(parsed_proxies) - len(working_proxies['proxy_strings']) - len(unchecked_proxies)}"
     )
+    if unchecked_proxies:
+        print(f"Not checked (deadline reached): {len(unchecked_proxies)}")
 
     categories = {}
     for proxy in working_proxies["proxy_objects"]:
@@ -415,13 +732,38 @@ async def main():
     for category, count in categories.items():
         print(f"- {category}: {count} proxies")
 
+    if ANONYMITY_CHECK["enabled"]:
+        anonymity_levels = {}
+        for proxy in working_proxies["proxy_objects"]:
+            anonymity = proxy.get("anonymity", "unknown")
+            anonymity_levels[anonymity] = anonymity_levels.get(anonymity, 0) + 1
+
+        print("\nProxy Anonymity Levels:")
+        for anonymity, count in anonymity_levels.items():
+            print(f"- {anonymity}: {count} proxies")
+
     if SAVE_TO_INPUT_FILE:
         print(f"Saving working proxies back to input file {PROXY_FILE}")
+        if unchecked_proxies:
+            # Keep proxies that were not checked for the next run
+            print(f"Keeping {len(unchecked_proxies)} unchecked proxies in input file")
+            working_proxies["proxy_strings"] = (
+                working_proxies["proxy_strings"] + unchecked_proxies
+            )
         await save_working_proxies(working_proxies, PROXY_FILE)
     else:
         print("Not saving to input file (disabled in config)")
         await save_working_proxies(working_proxies, OUTPUT_FILE)
 
+    if history is not None:
+        try:
+            update_history(
+                history, parsed_proxies, checked, working_proxies["proxy_objects"]
+            )
+            save_history(history, HISTORY_FILE)
+        except Exception as e:
+            print(f"Error updating history file: {e}")
+
 
 if __name__ == "__main__":
     if sys.platform.startswith("win"):